@@ -6,13 +6,20 @@ async database operations with connection pooling optimized for Vercel serverles
 """
 
 import os
+import asyncio
 import logging
+from pathlib import Path
 from typing import Optional, Dict, Any, List
 import asyncpg
 from contextlib import asynccontextmanager
 
 logger = logging.getLogger(__name__)
 
+# Pool sizing defaults; small pools suit serverless instances, and long-running
+# deployments can raise them via DB_POOL_MIN / DB_POOL_MAX
+DEFAULT_POOL_MIN_SIZE = 1
+DEFAULT_POOL_MAX_SIZE = 3
+
 class DatabaseManager:
     """
     Manages database connections and connection pooling for the Recipe Reader API.
@@ -29,32 +36,89 @@ class DatabaseManager:
         """Ensure singleton pattern for database manager."""
         if cls._instance is None:
             cls._instance = super().__new__(cls)
+            cls._instance._initialized = False
         return cls._instance
     
     def __init__(self):
         """Initialize database manager with connection parameters."""
-        if not hasattr(self, '_initialized'):
-            self.database_url = None  # Lazy initialization
-            self._initialized = True
+        if self._initialized:
+            return
+        self.database_url = None  # Lazy initialization
+        self._connect_lock = None  # (event loop, lock) pair, created on first use
+        self._initialized = True
     
     def _get_database_url(self) -> str:
         """
         Get database URL from environment variables.
         
+        The URL is read once and cached on the instance for later calls.
+        
         Returns:
             str: PostgreSQL connection URL
             
         Raises:
             ValueError: If DATABASE_URL is not configured
         """
+        if self.database_url:
+            return self.database_url
+        
         database_url = os.getenv("DATABASE_URL")
         if not database_url:
             raise ValueError(
                 "DATABASE_URL environment variable is required. "
                 "Please configure your Vercel PostgreSQL connection string."
             )
+        self.database_url = database_url
         return database_url
     
+    def _get_pool_sizes(self) -> tuple[int, int]:
+        """
+        Get connection pool bounds from environment variables.
+        
+        Invalid values (non-integers, negative sizes, an empty pool or a minimum
+        above the maximum) are logged and replaced by the defaults.
+        
+        Returns:
+            tuple[int, int]: (min_size, max_size) for the asyncpg pool
+        """
+        defaults = (DEFAULT_POOL_MIN_SIZE, DEFAULT_POOL_MAX_SIZE)
+        raw_min = os.getenv("DB_POOL_MIN")
+        raw_max = os.getenv("DB_POOL_MAX")
+        
+        try:
+            min_size = DEFAULT_POOL_MIN_SIZE if raw_min is None else int(raw_min)
+            max_size = DEFAULT_POOL_MAX_SIZE if raw_max is None else int(raw_max)
+        except ValueError:
+            logger.warning(
+                f"Invalid DB_POOL_MIN/DB_POOL_MAX ({raw_min!r}/{raw_max!r}); "
+                f"using defaults {defaults}"
+            )
+            return defaults
+        
+        if min_size < 0 or max_size < 1 or min_size > max_size:
+            logger.warning(
+                f"Invalid pool bounds min={min_size}, max={max_size}; using defaults {defaults}"
+            )
+            return defaults
+        
+        return min_size, max_size
+    
+    def _get_connect_lock(self) -> asyncio.Lock:
+        """
+        Get the lock that serializes concurrent first connects.
+        
+        asyncio locks bind to the event loop they are used on, and serverless
+        runtimes may switch loops between invocations, so a new lock is created
+        whenever the running loop changes.
+        
+        Returns:
+            asyncio.Lock: Lock bound to the running event loop
+        """
+        loop = asyncio.get_running_loop()
+        if self._connect_lock is None or self._connect_lock[0] is not loop:
+            self._connect_lock = (loop, asyncio.Lock())
+        return self._connect_lock[1]
+    
     async def connect(self) -> None:
         """
         Establish database connection pool optimized for Vercel serverless.
@@ -82,16 +146,17 @@ class DatabaseManager:
                 self._pool = None
                 self._is_connected = False
         
-        # Lazy initialization of database URL
-        if self.database_url is None:
-            self.database_url = self._get_database_url()
+        # Lazy initialization of database URL (cached after the first read)
+        database_url = self._get_database_url()
+        
+        min_size, max_size = self._get_pool_sizes()
         
         try:
             # Create asyncpg connection pool optimized for serverless
             self._pool = await asyncpg.create_pool(
-                self.database_url,
-                min_size=1,         # Minimum connections for serverless
-                max_size=3,         # Smaller pool for serverless environments
+                database_url,
+                min_size=min_size,
+                max_size=max_size,
                 max_queries=50000,  # Max queries per connection
                 max_inactive_connection_lifetime=300,  # 5 minutes
                 server_settings={
@@ -123,7 +188,6 @@ class DatabaseManager:
                 return True
             
             # Check if pool is still connected to the correct event loop
-            import asyncio
             current_loop = asyncio.get_event_loop()
             if hasattr(self._pool, '_loop') and self._pool._loop != current_loop:
                 return True
@@ -313,8 +377,13 @@ async def get_database() -> DatabaseManager:
     Raises:
         RuntimeError: If database connection fails
     """
-    if not db_manager.is_connected:
-        await db_manager.connect()
+    if db_manager.is_connected:
+        return db_manager
+    
+    async with db_manager._get_connect_lock():
+        # Another request may have connected while this one waited for the lock
+        if not db_manager.is_connected:
+            await db_manager.connect()
     
     return db_manager
 
@@ -337,14 +406,16 @@ async def test_connection() -> bool:
     """
     Test database connection for debugging purposes.
     
+    Reuses the pooled connection when one is open rather than cycling
+    connect/disconnect on every probe.
+    
     Returns:
         bool: True if connection successful, False otherwise
     """
     try:
-        await db_manager.connect()
-        health = await db_manager.health_check()
-        await db_manager.disconnect()
-        return health
+        if not db_manager.is_connected:
+            await db_manager.connect()
+        return await db_manager.health_check()
     except Exception as e:
         logger.error(f"Connection test failed: {str(e)}")
         return False
@@ -360,16 +431,15 @@ async def execute_migration(sql_file_path: str) -> bool:
         bool: True if migration successful, False otherwise
     """
     try:
-        with open(sql_file_path, 'r') as file:
-            sql_content = file.read()
+        # Read off the event loop so a slow disk doesn't stall other requests
+        sql_content = await asyncio.to_thread(Path(sql_file_path).read_text)
         
         await db_manager.connect()
         
-        # Split by semicolon and execute each statement
-        statements = [stmt.strip() for stmt in sql_content.split(';') if stmt.strip()]
-        
-        for statement in statements:
-            await db_manager.execute(statement)
+        # Send the whole file in one round-trip; without parameters asyncpg uses the
+        # simple query protocol, which runs multiple statements in one implicit transaction
+        if sql_content.strip():
+            await db_manager.execute(sql_content)
         
         logger.info(f"Migration {sql_file_path} executed successfully")
         return True
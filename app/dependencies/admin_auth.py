@@ -6,6 +6,9 @@ using X-Admin-Key header validation against environment variables.
 """
 
 import os
+import hashlib
+import secrets
+from functools import lru_cache
 from datetime import datetime, timezone
 from fastapi import HTTPException, Security
 from fastapi.security import APIKeyHeader
@@ -20,6 +23,12 @@ admin_key_header = APIKeyHeader(
     scheme_name="AdminKey"
 )
 
+@lru_cache(maxsize=1)
+def _expected_key_digest(expected_admin_key: str) -> bytes:
+    """Digest of the configured admin key, recomputed only when the key changes."""
+    return hashlib.blake2b(expected_admin_key.encode(), digest_size=32).digest()
+
+
 async def get_admin_from_key(admin_key: str = Security(admin_key_header)):
     """
     FastAPI dependency to authenticate admin users using admin API key.
@@ -64,8 +73,9 @@ async def get_admin_from_key(admin_key: str = Security(admin_key_header)):
             }
         )
     
-    # Validate admin key
-    if admin_key != expected_admin_key:
+    # Validate admin key in constant time against the cached digest
+    provided_digest = hashlib.blake2b(admin_key.encode(), digest_size=32).digest()
+    if not secrets.compare_digest(provided_digest, _expected_key_digest(expected_admin_key)):
         logger.warning(f"Admin request with invalid admin key: {admin_key[:4]}...")
         raise HTTPException(
             status_code=403,
@@ -2,7 +2,12 @@ from typing import List, Optional, Dict, Any, Union
 from pydantic import BaseModel, Field, model_validator, computed_field
 from datetime import datetime
 from enum import Enum
-import base64
+
+# Prefer the SIMD-accelerated pybase64 codec; its API matches the stdlib module
+try:
+    import pybase64 as base64
+except ImportError:
+    import base64
 
 
 class RecipeCategory(str, Enum):
@@ -3,7 +3,6 @@
 import os
 import json
 import time
-import base64
 import hashlib
 import logging
 from typing import Dict, Any, Optional, Union, List
@@ -14,6 +13,12 @@ import re
 from io import BytesIO
 from PIL import Image
 
+# Prefer the SIMD-accelerated pybase64 codec; its API matches the stdlib module
+try:
+    import pybase64 as base64
+except ImportError:
+    import base64
+
 # Import the NEW Google Gen AI SDK
 from google import genai
 from google.genai import types
@@ -125,17 +130,16 @@ class ImageProcessingService:
             cached_result = self.cache.get(cache_key)
             if cached_result:
                 self.logger.info("Returning cached result for image")
-                if isinstance(cached_result, RecipeResponse):
-                    return cached_result
-                # Convert cached dict to RecipeResponse
-                if isinstance(cached_result, dict):
-                    recipe = self._convert_to_recipe_model(cached_result)
-                    confidence_score = cached_result.get("confidence_score", 0.8)
-                    return RecipeResponse(
-                        recipe=recipe,
-                        confidence_score=confidence_score,
-                        processing_time=0.0
-                    )
+                # Reuse the validated response; deep-copy so callers can't mutate the
+                # cached entry, and only identity and timing are fresh
+                recipe = cached_result.recipe.model_copy(deep=True, update={
+                    "id": str(uuid.uuid4()),
+                    "creationTime": datetime.now()
+                })
+                return cached_result.model_copy(update={
+                    "recipe": recipe,
+                    "processing_time": 0.0
+                })
         
         # Generate prompt for image-based recipe extraction
         prompt = self._generate_image_extraction_prompt(options)
@@ -211,8 +215,8 @@ class ImageProcessingService:
                 # Cache the result if caching is enabled
                 if use_cache:
                     cache_key = self._generate_image_cache_key(processed_image['data'])
-                    result["confidence_score"] = confidence_score
-                    self.cache[cache_key] = result
+                    # Store a private copy so the caller can't mutate the cached entry
+                    self.cache[cache_key] = response_obj.model_copy(deep=True)
                 
                 self.logger.info(f"Successfully extracted recipe from image on attempt {attempt + 1}")
                 return response_obj
@@ -406,9 +410,9 @@ class ImageProcessingService:
                 image = rgb_image
             
             # Save processed image to bytes
-            output_buffer = BytesIO()
-            image.save(output_buffer, format='JPEG', quality=85, optimize=True)
-            processed_bytes = output_buffer.getvalue()
+            with BytesIO() as output_buffer:
+                image.save(output_buffer, format='JPEG', quality=85, optimize=True)
+                processed_bytes = output_buffer.getvalue()
             
             # Calculate quality score based on image properties
             quality_score = self._calculate_image_quality(image, original_size)
@@ -425,7 +429,7 @@ class ImageProcessingService:
             raise ValueError(f"Invalid image data: {str(e)}")
     
     def _calculate_image_quality(self, image: Image.Image, original_size: tuple) -> float:
-        """Calculate a quality score for the image (0-1)."""
+        """Calculate a quality score for the image (0-1) from its dimensions only."""
         quality = 0.5  # Base quality
         
         # Resolution factor
@@ -771,7 +775,7 @@ Provide the extracted text in a clean, readable format that preserves the origin
     
     def _generate_image_cache_key(self, image_bytes: bytes) -> str:
         """Generate a cache key for the image."""
-        return hashlib.md5(image_bytes).hexdigest()
+        return hashlib.blake2b(image_bytes, digest_size=16).hexdigest()
     
     def _create_image_fallback_result(self) -> Dict[str, Any]:
         """Create a basic fallback result when image extraction fails."""
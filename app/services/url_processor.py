@@ -2,11 +2,13 @@
 
 import re
 import json
+import hashlib
 import time
 import logging
 import asyncio
 import ipaddress
 import random
+from collections import OrderedDict
 from typing import Dict, Any, Optional, List
 from urllib.parse import urlparse
 from bs4 import BeautifulSoup
@@ -64,6 +66,9 @@ class UrlProcessor:
         'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/122.0.0.0 Safari/537.36 Edg/122.0.0.0',
     ]
     
+    # Maximum number of extraction results kept in the LRU cache
+    CACHE_MAX_SIZE = 256
+    
     # Content scoring constants
     MIN_CONTENT_SCORE_THRESHOLD = 10
     SHORT_CONTENT_PENALTY = 0.5
@@ -71,6 +76,40 @@ class UrlProcessor:
     MIN_CONTENT_LENGTH = 100
     MAX_CONTENT_LENGTH = 10000
     
+    # Recipe indicators, weighted x2 in content scoring
+    RECIPE_KEYWORDS = (
+        'ingredients', 'instructions', 'directions', 'recipe', 'cooking',
+        'bake', 'cook', 'preparation', 'prep time', 'cook time',
+        'servings', 'serves', 'yield', 'minutes', 'hours',
+        'מרכיבים', 'הוראות', 'מתכון', 'בישול', 'הכנה'  # Hebrew
+    )
+    
+    # Common cooking verbs
+    COOKING_VERBS = (
+        'mix', 'stir', 'add', 'combine', 'heat', 'boil', 'simmer',
+        'chop', 'slice', 'dice', 'pour', 'serve', 'season',
+        'לערבב', 'להוסיף', 'לחמם', 'לבשל', 'לחתוך'  # Hebrew
+    )
+    
+    # Precompiled patterns for duration parsing, microdata and text cleanup
+    DURATION_PATTERN = re.compile(r'PT(?:(\d+)H)?(?:(\d+)M)?')
+    MICRODATA_RECIPE_PATTERN = re.compile(r".*Recipe.*")
+    WHITESPACE_PATTERN = re.compile(r'\s+')
+    
+    # Common website elements removed from extracted text
+    NOISE_PATTERNS = tuple(re.compile(pattern, re.IGNORECASE) for pattern in (
+        r'cookie policy.*?accept',
+        r'advertisement',
+        r'subscribe.*?newsletter',
+        r'follow us on.*?social',
+        r'rate this recipe',
+        r'print recipe',
+        r'save recipe',
+        r'jump to recipe',
+        r'פרסומת',  # Hebrew: advertisement
+        r'מדיניות עוגיות',  # Hebrew: cookie policy
+    ))
+    
     def __init__(self):
         """Initialize the URL processor with curl_cffi support and enhanced configuration."""
         self.logger = logging.getLogger(__name__)
@@ -99,6 +138,9 @@ class UrlProcessor:
                 keepalive_expiry=30.0         # Keep connections for 30 seconds
             )
         )
+
+        # Extraction results keyed by a digest of the HTML content, least recently used first
+        self.cache = OrderedDict()
         
     def validate_url(self, url: str) -> bool:
         """Validate URL with SSRF protection."""
@@ -447,6 +489,21 @@ class UrlProcessor:
         Returns:
             Dict containing extracted content and metadata
         """
+        cache_key = self._generate_content_cache_key(html_content)
+        cached_result = self.cache.get(cache_key)
+        if cached_result:
+            self.logger.info(f"Returning cached extraction result for {source_url}")
+            self.cache.move_to_end(cache_key)
+            return dict(cached_result)
+        
+        result = self._extract_recipe_content(html_content, source_url)
+        self.cache[cache_key] = result
+        if len(self.cache) > self.CACHE_MAX_SIZE:
+            self.cache.popitem(last=False)
+        return dict(result)
+    
+    def _extract_recipe_content(self, html_content: str, source_url: str) -> Dict[str, Any]:
+        """Run the extraction strategies in order of confidence."""
         soup = BeautifulSoup(html_content, 'lxml')
         
         # Strategy 1: Try JSON-LD structured data
@@ -488,6 +545,10 @@ class UrlProcessor:
             'confidence': self.CONFIDENCE_FULL_TEXT
         }
     
+    def _generate_content_cache_key(self, html_content: str) -> str:
+        """Generate a cache key for the HTML content."""
+        return hashlib.blake2b(html_content.encode('utf-8'), digest_size=16).hexdigest()
+    
     def _extract_json_ld(self, soup: BeautifulSoup) -> Optional[str]:
         """
         Extract recipe content from JSON-LD structured data.
@@ -680,7 +741,7 @@ class UrlProcessor:
         
         try:
             # Simple regex for PT format (PT30M, PT1H30M, etc.)
-            match = re.search(r'PT(?:(\d+)H)?(?:(\d+)M)?', duration)
+            match = self.DURATION_PATTERN.search(duration)
             if match:
                 hours = int(match.group(1) or 0)
                 minutes = int(match.group(2) or 0)
@@ -694,7 +755,7 @@ class UrlProcessor:
         """Extract recipe content from microdata."""
         try:
             # Look for itemtype="http://schema.org/Recipe"
-            recipe_elements = soup.find_all(attrs={"itemtype": re.compile(r".*Recipe.*")})
+            recipe_elements = soup.find_all(attrs={"itemtype": self.MICRODATA_RECIPE_PATTERN})
             
             if not recipe_elements:
                 return None
@@ -795,25 +856,10 @@ class UrlProcessor:
         text_lower = text.lower()
         score = 0
         
-        # Recipe indicators
-        recipe_keywords = [
-            'ingredients', 'instructions', 'directions', 'recipe', 'cooking',
-            'bake', 'cook', 'preparation', 'prep time', 'cook time',
-            'servings', 'serves', 'yield', 'minutes', 'hours',
-            'מרכיבים', 'הוראות', 'מתכון', 'בישול', 'הכנה'  # Hebrew
-        ]
-        
-        for keyword in recipe_keywords:
+        for keyword in self.RECIPE_KEYWORDS:
             score += text_lower.count(keyword) * 2
         
-        # Common cooking verbs
-        cooking_verbs = [
-            'mix', 'stir', 'add', 'combine', 'heat', 'boil', 'simmer',
-            'chop', 'slice', 'dice', 'pour', 'serve', 'season',
-            'לערבב', 'להוסיף', 'לחמם', 'לבשל', 'לחתוך'  # Hebrew
-        ]
-        
-        for verb in cooking_verbs:
+        for verb in self.COOKING_VERBS:
             score += text_lower.count(verb)
         
         # Penalty for very short or very long content
@@ -831,27 +877,14 @@ class UrlProcessor:
             return ""
         
         # Remove excessive whitespace
-        text = re.sub(r'\s+', ' ', text)
+        text = self.WHITESPACE_PATTERN.sub(' ', text)
         
         # Remove common website elements
-        noise_patterns = [
-            r'cookie policy.*?accept',
-            r'advertisement',
-            r'subscribe.*?newsletter',
-            r'follow us on.*?social',
-            r'rate this recipe',
-            r'print recipe',
-            r'save recipe',
-            r'jump to recipe',
-            r'פרסומת',  # Hebrew: advertisement
-            r'מדיניות עוגיות',  # Hebrew: cookie policy
-        ]
-        
-        for pattern in noise_patterns:
-            text = re.sub(pattern, '', text, flags=re.IGNORECASE)
+        for pattern in self.NOISE_PATTERNS:
+            text = pattern.sub('', text)
         
         # Clean up extra spaces
-        text = re.sub(r'\s+', ' ', text)
+        text = self.WHITESPACE_PATTERN.sub(' ', text)
         
         return text.strip()
     
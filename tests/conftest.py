@@ -5,9 +5,38 @@ import json
 from pathlib import Path
 from unittest.mock import MagicMock, patch
 
+def pytest_addoption(parser):
+    parser.addoption(
+        "--run-integration", action="store_true", default=False,
+        help="run tests marked 'integration' (real external APIs)"
+    )
+
+def pytest_collection_modifyitems(config, items):
+    if config.getoption("--run-integration"):
+        return
+    skip_integration = pytest.mark.skip(reason="need --run-integration option to run")
+    for item in items:
+        if "integration" in item.keywords:
+            item.add_marker(skip_integration)
+
 # Path to test fixtures
 FIXTURES_DIR = Path(__file__).parent / "fixtures"
 
+@pytest.fixture(scope="session")
+def client():
+    """Shared TestClient; used without `with` so the lifespan never opens a real database pool."""
+    from fastapi.testclient import TestClient
+    from app.main import app
+
+    return TestClient(app)
+
+@pytest.fixture(scope="session")
+def processor():
+    """Shared TextProcessor; tests patch its gemini_service per test."""
+    from app.services.text_processor import TextProcessor
+
+    return TextProcessor()
+
 # Load recipe fixtures
 @pytest.fixture
 def simple_recipe_text():
@@ -40,6 +69,21 @@ def gemini_hebrew_complex_response():
     with open(FIXTURES_DIR / "responses" / "gemini_hebrew_complex_response.json", "r", encoding="utf-8") as f:
         return json.load(f)
 
+def _convert_response_fixture(filename):
+    from app.services.gemini_service import GeminiService
+
+    with open(FIXTURES_DIR / "responses" / filename, "r", encoding="utf-8") as f:
+        return GeminiService()._convert_to_recipe_model(json.load(f))
+
+# Recipe models built from the mock responses; converted once per session
+@pytest.fixture(scope="session")
+def hebrew_simple_recipe_instance():
+    return _convert_response_fixture("gemini_hebrew_simple_response.json")
+
+@pytest.fixture(scope="session")
+def hebrew_complex_recipe_instance():
+    return _convert_response_fixture("gemini_hebrew_complex_response.json")
+
 # Mock Gemini API response
 class MockResponse:
     def __init__(self, text):
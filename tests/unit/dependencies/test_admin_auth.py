@@ -11,7 +11,7 @@ from unittest.mock import patch, MagicMock
 from fastapi import HTTPException
 from datetime import datetime, timezone
 
-from app.dependencies.admin_auth import get_admin_from_key, admin_key_header
+from app.dependencies.admin_auth import get_admin_from_key, admin_key_header, _expected_key_digest
 
 
 class TestAdminAuthentication:
@@ -74,6 +74,31 @@ class TestAdminAuthentication:
         assert "Invalid Admin API Key" in exc_info.value.detail["message"]
         assert "timestamp" in exc_info.value.detail
 
+    @pytest.mark.asyncio
+    async def test_expected_key_digest_cached(self, mock_env_admin_key):
+        """Test the configured key is hashed once across repeated requests."""
+        _expected_key_digest.cache_clear()
+        
+        for _ in range(5):
+            await get_admin_from_key(mock_env_admin_key)
+        
+        cache_info = _expected_key_digest.cache_info()
+        assert cache_info.misses == 1
+        assert cache_info.hits == 4
+
+    @pytest.mark.asyncio
+    async def test_rotated_admin_key_takes_effect(self, mock_env_admin_key):
+        """Test a changed ADMIN_API_KEY is honoured despite the digest cache."""
+        await get_admin_from_key(mock_env_admin_key)
+        
+        with patch.dict(os.environ, {"ADMIN_API_KEY": "rotated-admin-key"}):
+            result = await get_admin_from_key("rotated-admin-key")
+            assert result["admin"] is True
+            
+            with pytest.raises(HTTPException) as exc_info:
+                await get_admin_from_key(mock_env_admin_key)
+            assert exc_info.value.status_code == 403
+
     @pytest.mark.asyncio
     async def test_missing_environment_variable(self):
         """Test error when ADMIN_API_KEY environment variable is not set."""
@@ -1,4 +1,3 @@
-from fastapi.testclient import TestClient
 from unittest.mock import patch
 from fastapi import Depends
 from app.main import app
@@ -17,9 +16,8 @@ def mock_get_client():
 
 # Override the dependency for all tests
 app.dependency_overrides[get_client_from_db] = mock_get_client
-client = TestClient(app)
 
-def test_process_recipe_text():
+def test_process_recipe_text(client):
     """Test the text processing endpoint."""
     # Simple recipe text
     recipe_text = """Simple Pancakes
@@ -99,7 +97,7 @@ def test_recipe_response_with_invalid_difficulty():
 
 
 @patch('app.services.text_processor.TextProcessor.process_text')
-def test_text_endpoint_with_difficulty_validation(mock_process_text):
+def test_text_endpoint_with_difficulty_validation(mock_process_text, client):
     """Test that the text processing endpoint properly handles difficulty validation in responses."""
     # Mock the text processor to return a recipe with valid difficulty
     mock_recipe = Recipe(
@@ -132,7 +130,7 @@ def test_text_endpoint_with_difficulty_validation(mock_process_text):
 
 
 @patch('app.services.text_processor.TextProcessor.process_text')
-def test_text_endpoint_handles_validation_errors(mock_process_text):
+def test_text_endpoint_handles_validation_errors(mock_process_text, client):
     """Test that the text processing endpoint handles difficulty validation errors properly."""
     from pydantic import ValidationError
     
@@ -160,12 +158,14 @@ def test_text_endpoint_handles_validation_errors(mock_process_text):
     assert response.status_code == 422
     data = response.json()
     assert "validation_errors" in data["detail"]
-    assert any("Invalid difficulty value" in error for error in data["detail"]["validation_errors"])
-    assert any("easy, medium, hard" in error for error in data["detail"]["validation_errors"])
+    # Scan the error messages once
+    validation_errors = "\n".join(data["detail"]["validation_errors"])
+    assert "Invalid difficulty value" in validation_errors
+    assert "easy, medium, hard" in validation_errors
 
 
 @patch('app.services.text_processor.TextProcessor.process_text')
-def test_text_endpoint_handles_processing_errors(mock_process_text):
+def test_text_endpoint_handles_processing_errors(mock_process_text, client):
     """Test that the text processing endpoint handles general processing errors properly."""
     # Mock the text processor to raise a generic exception
     mock_process_text.side_effect = Exception("Recipe processing failed due to invalid difficulty value")
@@ -1,13 +1,7 @@
 # tests/unit/test_gemini_service.py
 import pytest
 import json
-import os
-import sys
 from unittest.mock import patch, MagicMock
-from pathlib import Path
-
-# Add the project root directory to Python path
-sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../..")))
 
 # Import modules
 from app.services.gemini_service import GeminiService
@@ -18,8 +12,114 @@ class MockGeminiResponse:
     def __init__(self, text):
         self.text = text
 
-@pytest.mark.asyncio
-async def test_gemini_service_initialization():
+class _StubModels:
+    """Lightweight stand-in for `client.models` that counts calls"""
+    def __init__(self, text):
+        self.text = text
+        self.call_count = 0
+
+    def generate_content(self, **kwargs):
+        self.call_count += 1
+        return MockGeminiResponse(self.text)
+
+class _StubGenAIClient:
+    """Lightweight stand-in for `genai.Client` returning a fixed response"""
+    def __init__(self, text):
+        self.models = _StubModels(text)
+
+@pytest.fixture
+def stub_service(request):
+    """GeminiService whose client returns the parametrized JSON payload."""
+    service = GeminiService(api_key="test_key")
+    service.client = _StubGenAIClient(request.param)
+    return service
+
+_RESPONSE_BASIC_JSON = json.dumps({
+    "name": "Test Recipe",
+    "description": "A test recipe",
+    "ingredients": [
+        {"item": "flour", "amount": "2", "unit": "cups"},
+        {"item": "eggs", "amount": "3", "unit": "units"}
+    ],
+    "instructions": ["Mix ingredients", "Bake for 30 minutes"],
+    "stages": None,
+    "prepTime": 15,
+    "cookTime": 30,
+    "totalTime": 45,
+    "servings": 4,
+    "tags": ["baking"],
+    "mainIngredient": "flour"
+})
+
+_RESPONSE_HEBREW_STAGES_JSON = json.dumps({
+    "name": "פרגיות אסיאתיות",
+    "description": "מתכון טעים לפרגיות",
+    "ingredients": [
+        {"item": "פרגיות", "amount": "1", "unit": "ק\"ג"},
+        {"item": "שמן זית", "amount": "2", "unit": "כפות"}
+    ],
+    "instructions": None,
+    "stages": [
+        {
+            "title": "הכנה",
+            "instructions": ["לנקות את הפרגיות", "לחתוך למקומות"]
+        },
+        {
+            "title": "בישול", 
+            "instructions": ["לחמם את השמן", "לטגן את הפרגיות"]
+        }
+    ],
+    "prepTime": 20,
+    "cookTime": 15,
+    "totalTime": 35,
+    "servings": 4,
+    "tags": ["עוף", "אסיאתי"],
+    "mainIngredient": "פרגיות"
+})
+
+_RESPONSE_CACHED_JSON = json.dumps({
+    "name": "Cached Recipe", 
+    "description": "Cached",
+    "ingredients": [],
+    "instructions": ["Cached step"],
+    "stages": None
+})
+
+_RESPONSE_MISSING_INGREDIENTS_JSON = json.dumps({
+    "name": "Test Recipe",
+    # Missing required ingredients field
+    "instructions": ["Step 1"]
+})
+
+_RESPONSE_EASY_DIFFICULTY_JSON = json.dumps({
+    "name": "Easy Cookies", 
+    "description": "Simple cookies to make",
+    "difficulty": "easy",  # Valid enum value
+    "ingredients": [{"item": "flour", "amount": "1", "unit": "cup"}],
+    "instructions": ["Mix and bake"],
+    "stages": None
+})
+
+_RESPONSE_PREP_COOK_TIMES = {
+    "name": "Baked Chicken",
+    "description": "Chicken with cooling time",
+    "ingredients": [{"item": "chicken", "amount": "1", "unit": "lb"}],
+    "instructions": ["Bake for 30 minutes", "Cool for 15 minutes", "Serve"],
+    "stages": None,
+    "prepTime": 10,
+    "cookTime": 45  # Should include baking + cooling time (30 + 15)
+}
+_RESPONSE_PREP_COOK_TIMES_JSON = json.dumps(_RESPONSE_PREP_COOK_TIMES)
+
+_RESPONSE_RETRY_SUCCESS_JSON = json.dumps({
+    "name": "Success Recipe", 
+    "description": "Success",
+    "ingredients": [],
+    "instructions": ["Success step"],
+    "stages": None
+})
+
+async def test_gemini_service_initialization(monkeypatch):
     """Test GeminiService initialization with and without API key."""
     # Test with API key
     service = GeminiService(api_key="test_key")
@@ -27,11 +127,10 @@ async def test_gemini_service_initialization():
     assert hasattr(service, 'client')
     
     # Test without API key
-    with patch.dict('os.environ', {}, clear=True):
-        service = GeminiService()
-        assert service.available is False
+    monkeypatch.delenv("GOOGLE_AI_API_KEY", raising=False)
+    service = GeminiService()
+    assert service.available is False
 
-@pytest.mark.asyncio
 async def test_hebrew_detection():
     """Test Hebrew character detection."""
     service = GeminiService(api_key="test_key")
@@ -53,7 +152,6 @@ async def test_hebrew_detection():
     assert service._contains_hebrew("123456") is False
     assert service._contains_hebrew("!@#$%") is False
 
-@pytest.mark.asyncio
 async def test_structured_prompt_generation():
     """Test structured prompt generation for different scenarios."""
     service = GeminiService(api_key="test_key")
@@ -83,7 +181,6 @@ async def test_structured_prompt_generation():
     prompt = service._generate_structured_prompt(test_text, {})
     assert test_text in prompt
 
-@pytest.mark.asyncio
 async def test_cache_key_generation():
     """Test cache key generation."""
     service = GeminiService(api_key="test_key")
@@ -101,7 +198,6 @@ async def test_cache_key_generation():
     hebrew_key = service._generate_cache_key("פרגיות אסיאתיות")
     assert len(hebrew_key) == 32  # MD5 hash length
 
-@pytest.mark.asyncio
 async def test_preprocess_text():
     """Test text preprocessing functionality."""
     service = GeminiService(api_key="test_key")
@@ -123,7 +219,6 @@ async def test_preprocess_text():
     assert "save" not in cleaned
     assert "share" not in cleaned
 
-@pytest.mark.asyncio
 async def test_confidence_calculation():
     """Test confidence score calculation."""
     service = GeminiService(api_key="test_key")
@@ -156,7 +251,6 @@ async def test_confidence_calculation():
     confidence = service._calculate_confidence(complete_result)
     assert confidence > 0.9
 
-@pytest.mark.asyncio
 async def test_fallback_result_creation():
     """Test fallback result creation method."""
     service = GeminiService(api_key="test_key")
@@ -175,7 +269,6 @@ async def test_fallback_result_creation():
     result = service._create_fallback_result("פרגיות אסיאתיות\nמתכון טעים")
     assert result["name"] == "פרגיות אסיאתיות"
 
-@pytest.mark.asyncio
 async def test_convert_to_recipe_model():
     """Test conversion from extracted data to Recipe model."""
     service = GeminiService(api_key="test_key")
@@ -205,89 +298,32 @@ async def test_convert_to_recipe_model():
     assert recipe.id is not None  # Should be generated
     assert recipe.creationTime is not None  # Should be set
 
-@pytest.mark.asyncio
-async def test_extract_recipe_with_mock():
+@pytest.mark.parametrize("stub_service", [_RESPONSE_BASIC_JSON], indirect=True)
+async def test_extract_recipe_with_mock(stub_service):
     """Test extract_recipe with mocked new Gemini API."""
-    service = GeminiService(api_key="test_key")
-    
-    # Mock response that matches RecipeBase structure
-    mock_response_data = {
-        "name": "Test Recipe",
-        "description": "A test recipe",
-        "ingredients": [
-            {"item": "flour", "amount": "2", "unit": "cups"},
-            {"item": "eggs", "amount": "3", "unit": "units"}
-        ],
-        "instructions": ["Mix ingredients", "Bake for 30 minutes"],
-        "stages": None,
-        "prepTime": 15,
-        "cookTime": 30,
-        "totalTime": 45,
-        "servings": 4,
-        "tags": ["baking"],
-        "mainIngredient": "flour"
-    }
-    
-    with patch.object(service.client.models, 'generate_content') as mock_generate:
-        mock_response = MockGeminiResponse(json.dumps(mock_response_data))
-        mock_generate.return_value = mock_response
-        
-        result = await service.extract_recipe("Test recipe text")
-        
-        # Verify result structure
-        assert isinstance(result, RecipeResponse)
-        assert result.recipe.name == "Test Recipe"
-        assert len(result.recipe.ingredients) == 2
-        assert result.recipe.ingredients[0].item == "flour"
-        assert result.confidence_score > 0.7
-        assert result.processing_time >= 0
-
-@pytest.mark.asyncio
-async def test_extract_recipe_with_hebrew():
+    result = await stub_service.extract_recipe("Test recipe text")
+    
+    # Verify result structure
+    assert isinstance(result, RecipeResponse)
+    assert result.recipe.name == "Test Recipe"
+    assert len(result.recipe.ingredients) == 2
+    assert result.recipe.ingredients[0].item == "flour"
+    assert result.confidence_score > 0.7
+    assert result.processing_time >= 0
+
+@pytest.mark.parametrize("stub_service", [_RESPONSE_HEBREW_STAGES_JSON], indirect=True)
+async def test_extract_recipe_with_hebrew(stub_service):
     """Test extract_recipe with Hebrew content."""
-    service = GeminiService(api_key="test_key")
-    
-    hebrew_response_data = {
-        "name": "פרגיות אסיאתיות",
-        "description": "מתכון טעים לפרגיות",
-        "ingredients": [
-            {"item": "פרגיות", "amount": "1", "unit": "ק\"ג"},
-            {"item": "שמן זית", "amount": "2", "unit": "כפות"}
-        ],
-        "instructions": None,
-        "stages": [
-            {
-                "title": "הכנה",
-                "instructions": ["לנקות את הפרגיות", "לחתוך למקומות"]
-            },
-            {
-                "title": "בישול", 
-                "instructions": ["לחמם את השמן", "לטגן את הפרגיות"]
-            }
-        ],
-        "prepTime": 20,
-        "cookTime": 15,
-        "totalTime": 35,
-        "servings": 4,
-        "tags": ["עוף", "אסיאתי"],
-        "mainIngredient": "פרגיות"
-    }
-    
-    with patch.object(service.client.models, 'generate_content') as mock_generate:
-        mock_response = MockGeminiResponse(json.dumps(hebrew_response_data))
-        mock_generate.return_value = mock_response
-        
-        result = await service.extract_recipe("פרגיות אסיאתיות הכי טעימות")
-        
-        # Verify Hebrew content is preserved
-        assert result.recipe.name == "פרגיות אסיאתיות"
-        assert result.recipe.ingredients[0].item == "פרגיות"
-        assert result.recipe.stages is not None
-        assert len(result.recipe.stages) == 2
-        assert result.recipe.stages[0].title == "הכנה"
-        assert result.recipe.instructions is None  # Should use stages
-
-@pytest.mark.asyncio
+    result = await stub_service.extract_recipe("פרגיות אסיאתיות הכי טעימות")
+    
+    # Verify Hebrew content is preserved
+    assert result.recipe.name == "פרגיות אסיאתיות"
+    assert result.recipe.ingredients[0].item == "פרגיות"
+    assert result.recipe.stages is not None
+    assert len(result.recipe.stages) == 2
+    assert result.recipe.stages[0].title == "הכנה"
+    assert result.recipe.instructions is None  # Should use stages
+
 async def test_extract_recipe_retry_logic():
     """Test retry logic when extraction fails."""
     service = GeminiService(api_key="test_key")
@@ -299,94 +335,62 @@ async def test_extract_recipe_retry_logic():
         if call_count < 3:
             raise Exception("API Error")
         # Third attempt succeeds
-        success_data = {
-            "name": "Success Recipe", 
-            "description": "Success",
-            "ingredients": [],
-            "instructions": ["Success step"],
-            "stages": None
-        }
-        return MockGeminiResponse(json.dumps(success_data))
+        return MockGeminiResponse(_RESPONSE_RETRY_SUCCESS_JSON)
     
     with patch.object(service.client.models, 'generate_content', side_effect=mock_generate_content):
-        result = await service.extract_recipe("test recipe", {"max_retries": 3})
+        result = await service.extract_recipe("test recipe", {"max_retries": 3, "retry_delay": 0})
         
         # Should succeed on third attempt
         assert call_count == 3
         assert result.recipe.name == "Success Recipe"
 
-@pytest.mark.asyncio
 async def test_extract_recipe_fallback():
     """Test fallback result when all retries fail."""
     service = GeminiService(api_key="test_key")
     
     with patch.object(service.client.models, 'generate_content', side_effect=Exception("API Error")):
-        result = await service.extract_recipe("Failed Recipe Text", {"max_retries": 2})
+        result = await service.extract_recipe("Failed Recipe Text", {"max_retries": 1})
         
         # Should return fallback result
         assert result.confidence_score == 0.2
         assert "extraction-failed" in result.recipe.tags
         assert "Failed Recipe Text" in result.recipe.name or "Recipe Extraction Failed" in result.recipe.name
 
-@pytest.mark.asyncio
-async def test_extract_recipe_caching():
+@pytest.mark.parametrize("stub_service", [_RESPONSE_CACHED_JSON], indirect=True)
+async def test_extract_recipe_caching(stub_service):
     """Test caching behavior in extraction."""
-    service = GeminiService(api_key="test_key")
+    models = stub_service.client.models
     
-    mock_response_data = {
-        "name": "Cached Recipe", 
-        "description": "Cached",
-        "ingredients": [],
-        "instructions": ["Cached step"],
-        "stages": None
-    }
+    # First call
+    result1 = await stub_service.extract_recipe("test recipe")
+    assert models.call_count == 1
     
-    with patch.object(service.client.models, 'generate_content') as mock_generate:
-        mock_generate.return_value = MockGeminiResponse(json.dumps(mock_response_data))
-        
-        # First call
-        result1 = await service.extract_recipe("test recipe")
-        assert mock_generate.call_count == 1
-        
-        # Second call with same text should use cache
-        result2 = await service.extract_recipe("test recipe")
-        assert mock_generate.call_count == 1  # Still just one call
-        
-        # Results should be equivalent
-        assert result1.recipe.name == result2.recipe.name
+    # Second call with same text should use cache
+    result2 = await stub_service.extract_recipe("test recipe")
+    assert models.call_count == 1  # Still just one call
+    
+    # Results should be equivalent
+    assert result1.recipe.name == result2.recipe.name
 
-@pytest.mark.asyncio
-async def test_pydantic_integration():
+@pytest.mark.parametrize("stub_service", [_RESPONSE_MISSING_INGREDIENTS_JSON], indirect=True)
+async def test_pydantic_integration(stub_service):
     """Test that the service properly uses RecipeBase Pydantic model."""
-    service = GeminiService(api_key="test_key")
+    # Should handle validation error gracefully and return fallback
+    result = await stub_service.extract_recipe("test recipe")
     
-    # Test that invalid data structure raises validation error
-    invalid_response_data = {
-        "name": "Test Recipe",
-        # Missing required ingredients field
-        "instructions": ["Step 1"]
-    }
-    
-    with patch.object(service.client.models, 'generate_content') as mock_generate:
-        mock_generate.return_value = MockGeminiResponse(json.dumps(invalid_response_data))
-        
-        # Should handle validation error gracefully and return fallback
-        result = await service.extract_recipe("test recipe")
-        
-        # Should get fallback result due to validation failure
-        assert result.recipe.ingredients == []  # Empty list was auto-added
-        assert result.recipe.name == "Test Recipe" # Name should be preserved
+    # Should get fallback result due to validation failure
+    assert result.recipe.ingredients == []  # Empty list was auto-added
+    assert result.recipe.name == "Test Recipe" # Name should be preserved
 
-@pytest.mark.asyncio
-async def test_service_unavailable():
+async def test_service_unavailable(monkeypatch):
     """Test behavior when service is unavailable."""
-    with patch.dict('os.environ', {}, clear=True):
-        service = GeminiService()  # No API key
-        assert service.available is False
-        
-        # Should raise ValueError when trying to extract
-        with pytest.raises(ValueError, match="GeminiService is not available"):
-            await service.extract_recipe("test recipe")
+    monkeypatch.delenv("GOOGLE_AI_API_KEY", raising=False)
+    service = GeminiService()  # No API key
+    assert service.available is False
+    
+    # Should raise ValueError when trying to extract
+    with pytest.raises(ValueError, match="GeminiService is not available"):
+        await service.extract_recipe("test recipe")
 
 # Fixtures for backward compatibility (if you have separate fixture files)
 @pytest.fixture
@@ -453,62 +457,33 @@ def gemini_hebrew_complex_response():
     }
 
 
-@pytest.mark.asyncio
-async def test_extract_recipe_with_difficulty_validation():
+@pytest.mark.parametrize("stub_service", [_RESPONSE_EASY_DIFFICULTY_JSON], indirect=True)
+async def test_extract_recipe_with_difficulty_validation(stub_service):
     """Test full recipe extraction with difficulty enum validation."""
-    service = GeminiService(api_key="test_key")
-    
-    mock_response_data = {
-        "name": "Easy Cookies", 
-        "description": "Simple cookies to make",
-        "difficulty": "easy",  # Valid enum value
-        "ingredients": [{"item": "flour", "amount": "1", "unit": "cup"}],
-        "instructions": ["Mix and bake"],
-        "stages": None
-    }
+    result = await stub_service.extract_recipe("Simple cookie recipe")
     
-    with patch.object(service.client.models, 'generate_content') as mock_generate:
-        mock_generate.return_value = MockGeminiResponse(json.dumps(mock_response_data))
-        
-        result = await service.extract_recipe("Simple cookie recipe")
-        
-        # Should have valid difficulty enum
-        assert result.recipe.difficulty == RecipeDifficulty.EASY
-        assert result.recipe.name == "Easy Cookies"
+    # Should have valid difficulty enum
+    assert result.recipe.difficulty == RecipeDifficulty.EASY
+    assert result.recipe.name == "Easy Cookies"
 
 
-@pytest.mark.asyncio
-async def test_time_field_standardization():
+@pytest.mark.parametrize("stub_service", [_RESPONSE_PREP_COOK_TIMES_JSON], indirect=True)
+async def test_time_field_standardization(stub_service):
     """Test that new time handling works correctly - no totalTime extraction, merged waiting time."""
-    service = GeminiService(api_key="test_key")
-    
     # Test recipe with prep + cook times (should not extract totalTime)
-    mock_response_data = {
-        "name": "Baked Chicken",
-        "description": "Chicken with cooling time",
-        "ingredients": [{"item": "chicken", "amount": "1", "unit": "lb"}],
-        "instructions": ["Bake for 30 minutes", "Cool for 15 minutes", "Serve"],
-        "stages": None,
-        "prepTime": 10,
-        "cookTime": 45  # Should include baking + cooling time (30 + 15)
-    }
-    
-    with patch.object(service.client.models, 'generate_content') as mock_generate:
-        mock_generate.return_value = MockGeminiResponse(json.dumps(mock_response_data))
-        
-        result = await service.extract_recipe("Prep chicken for 10 minutes, bake for 30 minutes, cool for 15 minutes")
-        
-        # Should have computed totalTime (not extracted)
-        assert result.recipe.prepTime == 10
-        assert result.recipe.cookTime == 45  # Includes cooling time
-        assert result.recipe.totalTime == 55  # 10 + 45 (computed)
-        assert not hasattr(result.recipe, 'waitTime')  # waitTime field removed
-        
-        # Verify confidence calculation doesn't reference totalTime
-        confidence = service._calculate_confidence(mock_response_data)
-        assert confidence > 0.8  # Should be high confidence
-        
-        # Verify fallback result doesn't include totalTime
-        fallback = service._create_fallback_result("test text")
-        assert "totalTime" not in fallback
-        assert "waitTime" not in fallback
\ No newline at end of file
+    result = await stub_service.extract_recipe("Prep chicken for 10 minutes, bake for 30 minutes, cool for 15 minutes")
+    
+    # Should have computed totalTime (not extracted)
+    assert result.recipe.prepTime == 10
+    assert result.recipe.cookTime == 45  # Includes cooling time
+    assert result.recipe.totalTime == 55  # 10 + 45 (computed)
+    assert not hasattr(result.recipe, 'waitTime')  # waitTime field removed
+    
+    # Verify confidence calculation doesn't reference totalTime
+    confidence = stub_service._calculate_confidence(_RESPONSE_PREP_COOK_TIMES)
+    assert confidence > 0.8  # Should be high confidence
+    
+    # Verify fallback result doesn't include totalTime
+    fallback = stub_service._create_fallback_result("test text")
+    assert "totalTime" not in fallback
+    assert "waitTime" not in fallback
@@ -1,16 +1,22 @@
 # tests/test_image_processing_service.py
 import pytest
 import json
-import os
-import sys
-import base64
+import itertools
+import threading
+from functools import lru_cache
 from unittest.mock import patch, MagicMock
-from pathlib import Path
 from PIL import Image
 from io import BytesIO
 
-# Add the project root directory to Python path
-sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+# Prefer the SIMD-accelerated pybase64 codec; its API matches the stdlib module
+try:
+    import pybase64 as base64
+    _b64encode_str = base64.b64encode_as_string
+except ImportError:
+    import base64
+
+    def _b64encode_str(data):
+        return base64.b64encode(data).decode('ascii')
 
 # Import modules
 from app.services.image_processing_service import ImageProcessingService
@@ -23,27 +29,123 @@ class MockGeminiResponse:
         self.text = text
 
 
-def create_test_image(width=800, height=600, format='JPEG'):
-    """Create a test image in bytes format."""
-    image = Image.new('RGB', (width, height), color='white')
-    # Add some text-like content
-    from PIL import ImageDraw
-    draw = ImageDraw.Draw(image)
-    draw.text((50, 50), "Test Recipe Image", fill='black')
+_TLS = threading.local()
+
+
+def _get_buf():
+    """Return this thread's reusable encode buffer, reset to empty."""
+    buf = getattr(_TLS, 'buf', None)
+    if buf is None:
+        buf = _TLS.buf = BytesIO()
+    buf.seek(0)
+    buf.truncate()
+    return buf
+
+
+# Cheapest encoder settings per format; _process_image re-encodes anyway
+_FAST_SAVE_OPTIONS = {
+    'JPEG': {'quality': 60, 'optimize': False, 'progressive': False},
+    'PNG': {'compress_level': 1},
+    'WEBP': {'quality': 60, 'method': 0},
+}
+
+
+@lru_cache(maxsize=None)
+def _build_test_image(width, height, format):
+    """Encode a test image once per (width, height, format)."""
+    # Packed int colour (white) skips PIL's colour-name lookup
+    image = Image.new('RGB', (width, height), color=0xFFFFFF)
     
-    buffer = BytesIO()
-    image.save(buffer, format=format)
+    buffer = _get_buf()
+    image.save(buffer, format=format, **_FAST_SAVE_OPTIONS.get(format, {}))
     return buffer.getvalue()
 
 
+def create_test_image(width=800, height=600, format='JPEG'):
+    """Create a test image in bytes format; tests only need valid bytes."""
+    return _build_test_image(width, height, format)
+
+
+_DATA_URI_PREFIX = {
+    fmt: f"data:image/{fmt.lower()};base64," for fmt in ('JPEG', 'PNG', 'WEBP', 'GIF')
+}
+
+
+@lru_cache(maxsize=None)
 def image_to_base64(image_bytes, format='JPEG'):
     """Convert image bytes to base64 string."""
-    b64_string = base64.b64encode(image_bytes).decode('utf-8')
-    return f"data:image/{format.lower()};base64,{b64_string}"
+    return _DATA_URI_PREFIX[format] + _b64encode_str(image_bytes)
+
+
+# Default test image as a data URI, encoded once for the multi-image tests
+_DEFAULT_IMAGE_B64 = image_to_base64(create_test_image())
+
+
+# Canned Gemini responses, serialized once at import
+_MOCK_SUCCESS_JSON = json.dumps({
+    "name": "Test Recipe from Image",
+    "description": "A recipe extracted from an image",
+    "ingredients": [
+        {"item": "flour", "amount": "2", "unit": "cups"},
+        {"item": "sugar", "amount": "1", "unit": "cup"}
+    ],
+    "instructions": ["Mix ingredients", "Bake at 350F"],
+    "stages": None,
+    "prepTime": 10,
+    "cookTime": 30,
+    "totalTime": 40,
+    "servings": 4,
+    "tags": ["dessert"],
+    "mainIngredient": "flour"
+})
+
+_MOCK_STRUCTURED_JSON = json.dumps({
+    "name": "Structured Recipe",
+    "description": "A recipe with stages",
+    "ingredients": [{"item": "test", "amount": "1", "unit": "cup"}],
+    "instructions": None,
+    "stages": [
+        {"title": "Preparation", "instructions": ["Prepare ingredients"]},
+        {"title": "Cooking", "instructions": ["Cook the dish"]}
+    ],
+    "prepTime": None,
+    "cookTime": None,
+    "totalTime": None,
+    "servings": None,
+    "tags": [],
+    "mainIngredient": None
+})
+
+_MOCK_CACHED_JSON = json.dumps({
+    "name": "Cached Recipe",
+    "description": "Test caching",
+    "ingredients": [{"item": "test", "amount": "1", "unit": "cup"}],
+    "instructions": ["Test instruction"],
+    "stages": None,
+    "prepTime": None,
+    "cookTime": None,
+    "totalTime": None,
+    "servings": None,
+    "tags": [],
+    "mainIngredient": None
+})
+
+
+@pytest.fixture(scope="session")
+def _shared_image_service():
+    """Single ImageProcessingService instance for the whole session."""
+    return ImageProcessingService(api_key="test_key")
+
+
+@pytest.fixture
+def image_service(_shared_image_service):
+    """Shared ImageProcessingService with its result cache reset per test."""
+    _shared_image_service.cache.clear()
+    return _shared_image_service
 
 
 @pytest.mark.asyncio
-async def test_image_processing_service_initialization():
+async def test_image_processing_service_initialization(monkeypatch):
     """Test ImageProcessingService initialization with and without API key."""
     # Test with API key
     service = ImageProcessingService(api_key="test_key")
@@ -53,39 +155,32 @@ async def test_image_processing_service_initialization():
     assert service.supported_formats == {'JPEG', 'JPG', 'PNG', 'WEBP', 'GIF'}
     
     # Test without API key
-    with patch.dict('os.environ', {}, clear=True):
-        service = ImageProcessingService()
-        assert service.available is False
+    monkeypatch.delenv("GOOGLE_AI_API_KEY", raising=False)
+    service = ImageProcessingService()
+    assert service.available is False
 
 
 @pytest.mark.asyncio
-async def test_image_processing_valid_formats():
+@pytest.mark.parametrize("format", ['JPEG', 'PNG', 'WEBP'])
+async def test_image_processing_valid_formats(image_service, format):
     """Test image processing with different valid formats."""
-    service = ImageProcessingService(api_key="test_key")
-    
-    # Test different formats
-    formats = ['JPEG', 'PNG', 'WEBP']
+    image_bytes = create_test_image(format=format)
+    result = await image_service._process_image(image_bytes, {})
     
-    for format in formats:
-        image_bytes = create_test_image(format=format)
-        result = await service._process_image(image_bytes, {})
-        
-        assert result['mime_type'] == 'image/jpeg'  # All converted to JPEG
-        assert result['data'] is not None
-        assert result['dimensions'] == (800, 600)
-        assert 0.1 <= result['quality_score'] <= 1.0
+    assert result['mime_type'] == 'image/jpeg'  # All converted to JPEG
+    assert result['data'] is not None
+    assert result['dimensions'] == (800, 600)
+    assert 0.1 <= result['quality_score'] <= 1.0
 
 
 @pytest.mark.asyncio
-async def test_image_processing_base64_input():
+async def test_image_processing_base64_input(image_service):
     """Test image processing with base64 encoded input."""
-    service = ImageProcessingService(api_key="test_key")
-    
     # Create test image and convert to base64
     image_bytes = create_test_image()
     base64_string = image_to_base64(image_bytes)
     
-    result = await service._process_image(base64_string, {})
+    result = await image_service._process_image(base64_string, {})
     
     assert result['mime_type'] == 'image/jpeg'
     assert result['data'] is not None
@@ -93,46 +188,50 @@ async def test_image_processing_base64_input():
 
 
 @pytest.mark.asyncio
-async def test_image_processing_size_limits():
+async def test_image_processing_size_limits(image_service):
     """Test image processing with size limits."""
-    service = ImageProcessingService(api_key="test_key")
-    
     # Test oversized image (should be resized)
     large_image = create_test_image(width=3000, height=3000)
-    result = await service._process_image(large_image, {})
+    result = await image_service._process_image(large_image, {})
     
     # Should be resized to max_dimension
     max_dim = max(result['dimensions'])
-    assert max_dim <= service.max_dimension
+    assert max_dim <= image_service.max_dimension
 
 
 @pytest.mark.asyncio
-async def test_image_processing_invalid_data():
+async def test_image_processing_invalid_data(image_service):
     """Test image processing with invalid data."""
-    service = ImageProcessingService(api_key="test_key")
-    
     # Test invalid base64
     with pytest.raises(ValueError, match="Invalid image data"):
-        await service._process_image("invalid_base64", {})
+        await image_service._process_image("invalid_base64", {})
     
     # Test non-image data
-    invalid_data = base64.b64encode(b"not an image").decode('utf-8')
+    invalid_data = _b64encode_str(b"not an image")
     with pytest.raises(ValueError, match="Invalid image data"):
-        await service._process_image(invalid_data, {})
+        await image_service._process_image(invalid_data, {})
+
+
+@pytest.fixture(scope="session")
+def high_res_white_image():
+    """2000x1500 white image, shared read-only across the session."""
+    return Image.new('RGB', (2000, 1500), color='white')
+
+
+@pytest.fixture(scope="session")
+def low_res_white_image():
+    """200x150 white image, shared read-only across the session."""
+    return Image.new('RGB', (200, 150), color='white')
 
 
 @pytest.mark.asyncio
-async def test_image_quality_calculation():
+async def test_image_quality_calculation(image_service, high_res_white_image, low_res_white_image):
     """Test image quality score calculation."""
-    service = ImageProcessingService(api_key="test_key")
-    
     # High resolution image
-    high_res_image = Image.new('RGB', (2000, 1500), color='white')
-    quality_high = service._calculate_image_quality(high_res_image, (2000, 1500))
+    quality_high = image_service._calculate_image_quality(high_res_white_image, (2000, 1500))
     
     # Low resolution image
-    low_res_image = Image.new('RGB', (200, 150), color='white')
-    quality_low = service._calculate_image_quality(low_res_image, (200, 150))
+    quality_low = image_service._calculate_image_quality(low_res_white_image, (200, 150))
     
     # High resolution should have better quality score
     assert quality_high > quality_low
@@ -141,38 +240,19 @@ async def test_image_quality_calculation():
 
 
 @pytest.mark.asyncio
-async def test_extract_recipe_from_image_success():
+async def test_extract_recipe_from_image_success(image_service):
     """Test successful recipe extraction from image."""
-    service = ImageProcessingService(api_key="test_key")
-    
     # Mock API response
-    mock_response_data = {
-        "name": "Test Recipe from Image",
-        "description": "A recipe extracted from an image",
-        "ingredients": [
-            {"item": "flour", "amount": "2", "unit": "cups"},
-            {"item": "sugar", "amount": "1", "unit": "cup"}
-        ],
-        "instructions": ["Mix ingredients", "Bake at 350F"],
-        "stages": None,
-        "prepTime": 10,
-        "cookTime": 30,
-        "totalTime": 40,
-        "servings": 4,
-        "tags": ["dessert"],
-        "mainIngredient": "flour"
-    }
-    
-    mock_response = MockGeminiResponse(json.dumps(mock_response_data))
+    mock_response = MockGeminiResponse(_MOCK_SUCCESS_JSON)
     
     # Mock the client call
-    with patch.object(service, 'client', autospec=True) as mock_client:
+    with patch.object(image_service, 'client', autospec=True) as mock_client:
         mock_client.models.generate_content.return_value = mock_response
         
         # Test image
         image_bytes = create_test_image()
         
-        result = await service.extract_recipe_from_image(image_bytes)
+        result = await image_service.extract_recipe_from_image(image_bytes)
         
         assert isinstance(result, RecipeResponse)
         assert result.recipe.name == "Test Recipe from Image"
@@ -183,30 +263,11 @@ async def test_extract_recipe_from_image_success():
 
 
 @pytest.mark.asyncio
-async def test_extract_recipe_from_image_with_options():
+async def test_extract_recipe_from_image_with_options(image_service):
     """Test recipe extraction with various options."""
-    service = ImageProcessingService(api_key="test_key")
+    mock_response = MockGeminiResponse(_MOCK_STRUCTURED_JSON)
     
-    mock_response_data = {
-        "name": "Structured Recipe",
-        "description": "A recipe with stages",
-        "ingredients": [{"item": "test", "amount": "1", "unit": "cup"}],
-        "instructions": None,
-        "stages": [
-            {"title": "Preparation", "instructions": ["Prepare ingredients"]},
-            {"title": "Cooking", "instructions": ["Cook the dish"]}
-        ],
-        "prepTime": None,
-        "cookTime": None,
-        "totalTime": None,
-        "servings": None,
-        "tags": [],
-        "mainIngredient": None
-    }
-    
-    mock_response = MockGeminiResponse(json.dumps(mock_response_data))
-    
-    with patch.object(service, 'client') as mock_client:
+    with patch.object(image_service, 'client') as mock_client:
         mock_client.models.generate_content.return_value = mock_response
         
         options = {
@@ -217,7 +278,7 @@ async def test_extract_recipe_from_image_with_options():
         }
         
         image_bytes = create_test_image()
-        result = await service.extract_recipe_from_image(image_bytes, options)
+        result = await image_service.extract_recipe_from_image(image_bytes, options)
         
         assert result.recipe.stages is not None
         assert len(result.recipe.stages) == 2
@@ -225,18 +286,16 @@ async def test_extract_recipe_from_image_with_options():
 
 
 @pytest.mark.asyncio
-async def test_extract_recipe_fallback():
+async def test_extract_recipe_fallback(image_service):
     """Test fallback behavior when extraction fails."""
-    service = ImageProcessingService(api_key="test_key")
-    
     # Mock client to raise exception
-    with patch.object(service, 'client') as mock_client:
+    with patch.object(image_service, 'client') as mock_client:
         mock_client.models.generate_content.side_effect = Exception("API Error")
         
         image_bytes = create_test_image()
         options = {"max_retries": 1}  # Reduce retries for faster test
         
-        result = await service.extract_recipe_from_image(image_bytes, options)
+        result = await image_service.extract_recipe_from_image(image_bytes, options)
         
         assert isinstance(result, RecipeResponse)
         assert result.recipe.name == "Image Processing Failed"
@@ -245,36 +304,22 @@ async def test_extract_recipe_fallback():
 
 
 @pytest.mark.asyncio
-async def test_image_cache_functionality():
+async def test_image_cache_functionality(image_service):
     """Test caching functionality for image processing."""
-    service = ImageProcessingService(api_key="test_key")
-    
-    mock_response_data = {
-        "name": "Cached Recipe",
-        "description": "Test caching",
-        "ingredients": [{"item": "test", "amount": "1", "unit": "cup"}],
-        "instructions": ["Test instruction"],
-        "stages": None,
-        "prepTime": None,
-        "cookTime": None,
-        "totalTime": None,
-        "servings": None,
-        "tags": [],
-        "mainIngredient": None
-    }
+    mock_response = MockGeminiResponse(_MOCK_CACHED_JSON)
     
-    mock_response = MockGeminiResponse(json.dumps(mock_response_data))
-    
-    with patch.object(service, 'client') as mock_client:
+    with patch.object(image_service, 'client') as mock_client:
         mock_client.models.generate_content.return_value = mock_response
         
+        # The same bytes object is passed to every cached call below; the service
+        # keys its cache on the re-encoded JPEG, so hits depend on content only
         image_bytes = create_test_image()
         
         # First call - should hit API
-        result1 = await service.extract_recipe_from_image(image_bytes, {"use_cache": True})
+        result1 = await image_service.extract_recipe_from_image(image_bytes, {"use_cache": True})
         
         # Second call - should use cache
-        result2 = await service.extract_recipe_from_image(image_bytes, {"use_cache": True})
+        result2 = await image_service.extract_recipe_from_image(image_bytes, {"use_cache": True})
         
         # Should have called API only once
         assert mock_client.models.generate_content.call_count == 1
@@ -285,16 +330,22 @@ async def test_image_cache_functionality():
         assert result1.confidence_score == result2.confidence_score
         assert result2.processing_time == 0.0, "Cached result should have 0 processing time"
         
+        # Mutating returned recipes must not leak into later cache hits
+        ingredient_count = len(result2.recipe.ingredients)
+        result1.recipe.ingredients.clear()
+        result2.recipe.ingredients.clear()
+        result_again = await image_service.extract_recipe_from_image(image_bytes, {"use_cache": True})
+        assert len(result_again.recipe.ingredients) == ingredient_count > 0
+        assert mock_client.models.generate_content.call_count == 1
+        
         # Test cache invalidation - different image should call API again
         # Create a genuinely different image by changing size
-        from PIL import Image
-        from io import BytesIO
         different_image = Image.new('RGB', (900, 700), color='blue')  # Different size and color
-        different_buffer = BytesIO()
-        different_image.save(different_buffer, format='JPEG')
-        different_image_bytes = different_buffer.getvalue()
+        with BytesIO() as different_buffer:
+            different_image.save(different_buffer, format='JPEG')
+            different_image_bytes = different_buffer.getvalue()
         
-        result3 = await service.extract_recipe_from_image(different_image_bytes, {"use_cache": True})
+        result3 = await image_service.extract_recipe_from_image(different_image_bytes, {"use_cache": True})
         
         # Should have called API twice now (once for each unique image)
         assert mock_client.models.generate_content.call_count == 2
@@ -303,7 +354,7 @@ async def test_image_cache_functionality():
         assert result3.recipe.name == result1.recipe.name
         
         # Test cache disabled - should call API again even with same image
-        result4 = await service.extract_recipe_from_image(image_bytes, {"use_cache": False})
+        result4 = await image_service.extract_recipe_from_image(image_bytes, {"use_cache": False})
         
         # Should have called API three times now
         assert mock_client.models.generate_content.call_count == 3
@@ -313,94 +364,87 @@ async def test_image_cache_functionality():
         assert result4.processing_time > 0, "Non-cached result should have processing time"
 
 
-def test_image_process_request_validation():
-    """Test ImageProcessRequest validation for single and multiple images."""
-    # Valid single image
-    image_bytes = create_test_image()
-    valid_b64 = image_to_base64(image_bytes)
-    
-    request = ImageProcessRequest(image_data=valid_b64, options={})
-    assert request.image_data == valid_b64
-    
-    # Valid multiple images
-    image_list = [valid_b64, valid_b64]
-    request_multi = ImageProcessRequest(image_data=image_list, options={})
-    assert request_multi.image_data == image_list
-    
-    # Invalid base64 data (single)
-    with pytest.raises(ValueError, match="Invalid base64 image data in image 1"):
-        ImageProcessRequest(image_data="invalid_base64", options={})
-    
-    # Invalid base64 data (multiple)
-    with pytest.raises(ValueError, match="Invalid base64 image data in image 2"):
-        ImageProcessRequest(image_data=[valid_b64, "invalid_base64"], options={})
-    
-    # Empty list
-    with pytest.raises(ValueError, match="At least one image is required"):
-        ImageProcessRequest(image_data=[], options={})
-    
-    # Too many images
-    too_many_images = [valid_b64] * 11
-    with pytest.raises(ValueError, match="Maximum 10 images allowed"):
-        ImageProcessRequest(image_data=too_many_images, options={})
+# The validator only checks the header and decodability, so a 1x1 image suffices
+_TINY_JPEG_B64 = image_to_base64(create_test_image(width=1, height=1))
+
+
+@pytest.mark.parametrize("image_data", [
+    _TINY_JPEG_B64,                    # Valid single image
+    [_TINY_JPEG_B64, _TINY_JPEG_B64],  # Valid multiple images
+])
+def test_image_process_request_validation(image_data):
+    """Test ImageProcessRequest accepts single and multiple images."""
+    request = ImageProcessRequest(image_data=image_data, options={})
+    assert request.image_data == image_data
+
+
+@pytest.mark.parametrize("image_data, error", [
+    ("invalid_base64", "Invalid base64 image data in image 1"),
+    ([_TINY_JPEG_B64, "invalid_base64"], "Invalid base64 image data in image 2"),
+    ([], "At least one image is required"),
+    (list(itertools.repeat(_TINY_JPEG_B64, 11)), "Maximum 10 images allowed"),
+    ("data:image/bmp;base64," + _b64encode_str(b"test"), "Unsupported image format in image 1"),
+])
+def test_image_process_request_validation_errors(image_data, error):
+    """Test ImageProcessRequest rejects invalid single and multiple images."""
+    with pytest.raises(ValueError, match=error):
+        ImageProcessRequest(image_data=image_data, options={})
+
+
+# Complete recipe data
+_COMPLETE_RECIPE = {
+    "name": "Complete Recipe",
+    "ingredients": [
+        {"item": "flour", "amount": "2", "unit": "cups"},
+        {"item": "sugar", "amount": "1", "unit": "cup"},
+        {"item": "eggs", "amount": "3", "unit": "units"}
+    ],
+    "instructions": ["Step 1", "Step 2", "Step 3"],
+    "prepTime": 10,
+    "cookTime": 30,
+    "servings": 4,
+    "mainIngredient": "flour",
+    "tags": ["dessert", "baking"]
+}
+
+# Incomplete recipe data
+_INCOMPLETE_RECIPE = {
+    "name": "Incomplete Recipe",
+    "ingredients": [{"item": "flour", "amount": "1", "unit": "cup"}],
+    "instructions": ["Mix"],
+    "prepTime": None,
+    "cookTime": None,
+    "servings": None,
+    "mainIngredient": None,
+    "tags": []
+}
+
+
+# Expected bounds per case; the ordering between the two cases is checked separately
+@pytest.mark.asyncio
+@pytest.mark.parametrize("recipe, image_quality, lower, upper", [
+    (_COMPLETE_RECIPE, 0.8, 0.5, 0.9),    # High quality image; 0.9 is the cap for images
+    (_INCOMPLETE_RECIPE, 0.3, 0.1, 0.5),  # Low quality image; 0.1 is the minimum
+])
+async def test_confidence_scoring(image_service, recipe, image_quality, lower, upper):
+    """Test confidence score calculation for image extraction."""
+    confidence = image_service._calculate_image_confidence(recipe, image_quality)
     
-    # Unsupported format
-    unsupported_data = "data:image/bmp;base64," + base64.b64encode(b"test").decode()
-    with pytest.raises(ValueError, match="Unsupported image format in image 1"):
-        ImageProcessRequest(image_data=unsupported_data, options={})
+    assert lower <= confidence <= upper
 
 
 @pytest.mark.asyncio
-async def test_confidence_scoring():
-    """Test confidence score calculation for image extraction."""
-    service = ImageProcessingService(api_key="test_key")
-    
-    # Complete recipe data
-    complete_recipe = {
-        "name": "Complete Recipe",
-        "ingredients": [
-            {"item": "flour", "amount": "2", "unit": "cups"},
-            {"item": "sugar", "amount": "1", "unit": "cup"},
-            {"item": "eggs", "amount": "3", "unit": "units"}
-        ],
-        "instructions": ["Step 1", "Step 2", "Step 3"],
-        "prepTime": 10,
-        "cookTime": 30,
-        "servings": 4,
-        "mainIngredient": "flour",
-        "tags": ["dessert", "baking"]
-    }
-    
-    # Incomplete recipe data
-    incomplete_recipe = {
-        "name": "Incomplete Recipe",
-        "ingredients": [{"item": "flour", "amount": "1", "unit": "cup"}],
-        "instructions": ["Mix"],
-        "prepTime": None,
-        "cookTime": None,
-        "servings": None,
-        "mainIngredient": None,
-        "tags": []
-    }
+async def test_confidence_scoring_prefers_complete_recipe(image_service):
+    """Test a complete recipe from a good image outscores an incomplete one from a poor image."""
+    complete_conf = image_service._calculate_image_confidence(_COMPLETE_RECIPE, 0.8)
+    incomplete_conf = image_service._calculate_image_confidence(_INCOMPLETE_RECIPE, 0.3)
     
-    # High quality image
-    high_quality_score = 0.8
-    complete_confidence = service._calculate_image_confidence(complete_recipe, high_quality_score)
-    
-    # Low quality image  
-    low_quality_score = 0.3
-    incomplete_confidence = service._calculate_image_confidence(incomplete_recipe, low_quality_score)
-    
-    assert complete_confidence > incomplete_confidence
-    assert complete_confidence <= 0.9  # Cap for images
-    assert incomplete_confidence >= 0.1  # Minimum confidence
+    assert complete_conf > incomplete_conf
 
 
 @pytest.mark.asyncio
-async def test_multiple_images_processing():
+async def test_multiple_images_processing(image_service):
     """Test processing multiple images for multi-page recipes."""
-    service = ImageProcessingService(api_key="test_key")
-    
     # Mock OCR responses for each image
     mock_ocr_responses = [
         "Recipe Title: Multi-Page Recipe\nIngredients:\n2 cups flour\n1 cup sugar",
@@ -425,22 +469,21 @@ async def test_multiple_images_processing():
     }
     
     # Mock the OCR calls
-    with patch.object(service, '_extract_text_from_image') as mock_ocr:
+    with patch.object(image_service, '_extract_text_from_image') as mock_ocr:
         mock_ocr.side_effect = mock_ocr_responses
         
         # Mock the TextProcessor
-        with patch.object(service.text_processor, 'process_text') as mock_text_processor:
+        with patch.object(image_service.text_processor, 'process_text') as mock_text_processor:
             mock_text_processor.return_value = RecipeResponse(
-                recipe=service._convert_to_recipe_model(mock_recipe_data),
+                recipe=image_service._convert_to_recipe_model(mock_recipe_data),
                 confidence_score=0.85,
                 processing_time=1.0
             )
             
             # Test with multiple images
-            image_bytes = create_test_image()
-            image_list = [image_to_base64(image_bytes), image_to_base64(image_bytes)]
+            image_list = [_DEFAULT_IMAGE_B64, _DEFAULT_IMAGE_B64]
             
-            result = await service.extract_recipe_from_image(image_list)
+            result = await image_service.extract_recipe_from_image(image_list)
             
             assert isinstance(result, RecipeResponse)
             assert result.recipe.name == "Multi-Page Recipe"
@@ -460,21 +503,19 @@ async def test_multiple_images_processing():
 
 
 @pytest.mark.asyncio
-async def test_ocr_text_extraction():
+async def test_ocr_text_extraction(image_service):
     """Test OCR-only text extraction from images."""
-    service = ImageProcessingService(api_key="test_key")
-    
     mock_ocr_text = "Recipe: Test OCR\nIngredients: flour, sugar\nInstructions: mix and bake"
     
     # Mock the Gemini Vision API response for OCR
     mock_response = MagicMock()
     mock_response.text = mock_ocr_text
     
-    with patch.object(service, 'client') as mock_client:
+    with patch.object(image_service, 'client') as mock_client:
         mock_client.models.generate_content.return_value = mock_response
         
         image_bytes = create_test_image()
-        extracted_text = await service._extract_text_from_image(image_bytes, {})
+        extracted_text = await image_service._extract_text_from_image(image_bytes, {})
         
         assert extracted_text == mock_ocr_text
         
@@ -485,10 +526,8 @@ async def test_ocr_text_extraction():
 
 
 @pytest.mark.asyncio
-async def test_text_consolidation():
+async def test_text_consolidation(image_service):
     """Test text consolidation logic for multiple pages."""
-    service = ImageProcessingService(api_key="test_key")
-    
     # Sample extracted texts from multiple pages
     extracted_texts = [
         {
@@ -501,7 +540,7 @@ async def test_text_consolidation():
         }
     ]
     
-    consolidated = service._consolidate_extracted_texts(extracted_texts)
+    consolidated = image_service._consolidate_extracted_texts(extracted_texts)
     
     # Check that consolidation worked properly
     assert "MULTI-PAGE RECIPE" in consolidated
@@ -513,18 +552,15 @@ async def test_text_consolidation():
 
 
 @pytest.mark.asyncio
-async def test_fallback_when_no_text_extracted():
+async def test_fallback_when_no_text_extracted(image_service):
     """Test fallback behavior when no text can be extracted from any image."""
-    service = ImageProcessingService(api_key="test_key")
-    
     # Mock OCR to return empty strings
-    with patch.object(service, '_extract_text_from_image') as mock_ocr:
+    with patch.object(image_service, '_extract_text_from_image') as mock_ocr:
         mock_ocr.return_value = ""
         
-        image_bytes = create_test_image()
-        image_list = [image_to_base64(image_bytes), image_to_base64(image_bytes)]
+        image_list = [_DEFAULT_IMAGE_B64, _DEFAULT_IMAGE_B64]
         
-        result = await service.extract_recipe_from_image(image_list)
+        result = await image_service.extract_recipe_from_image(image_list)
         
         assert isinstance(result, RecipeResponse)
         assert result.recipe.name == "Image Processing Failed"
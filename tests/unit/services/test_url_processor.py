@@ -2,23 +2,72 @@
 
 import pytest
 import pytest_asyncio
-from unittest.mock import Mock, patch, AsyncMock
+from unittest.mock import patch
 import httpx
 from app.services.url_processor import UrlProcessor
 
 
+# Canned responses per URL, consumed in order; the last entry is sticky
+_ROUTES = {}
+
+
+def _route_request(request):
+    """MockTransport handler serving the responses registered in _ROUTES."""
+    queue = _ROUTES.get(str(request.url))
+    if not queue:
+        raise httpx.ConnectError(f"No mock route for {request.url}", request=request)
+    outcome = queue.pop(0) if len(queue) > 1 else queue[0]
+    if isinstance(outcome, Exception):
+        raise outcome
+    return outcome
+
+
+def _mk_resp(status=200, text="", headers=None):
+    """Build an httpx response as the mocked transport would return it."""
+    return httpx.Response(status, text=text, headers=headers or {"content-type": "text/html"})
+
+
+@pytest_asyncio.fixture(scope="session")
+async def _shared_url_processor():
+    """Shared UrlProcessor for the session, wired to a mocked httpx transport."""
+    processor = UrlProcessor()
+    await processor.http_client.aclose()
+    processor.http_client = httpx.AsyncClient(transport=httpx.MockTransport(_route_request))
+    yield processor
+    # Cleanup: close the HTTP client once all tests are done
+    await processor.http_client.aclose()
+
+
+@pytest.fixture
+def url_processor(_shared_url_processor):
+    """Shared UrlProcessor with its extraction cache reset per test."""
+    _shared_url_processor.cache.clear()
+    return _shared_url_processor
+
+
+@pytest.fixture(autouse=True)
+def _no_sleep(monkeypatch):
+    """Make retry/backoff sleeps immediate; yields the requested delays."""
+    delays = []
+
+    async def _noop(delay, *args, **kwargs):
+        delays.append(delay)
+
+    monkeypatch.setattr("app.services.url_processor.asyncio.sleep", _noop)
+    yield delays
+
+
+@pytest.fixture
+def http_routes():
+    """Per-test URL -> [response or exception, ...] table for the mock transport."""
+    yield _ROUTES
+    _ROUTES.clear()
+
+
 class TestUrlProcessor:
     """Test suite for UrlProcessor service."""
 
-    @pytest_asyncio.fixture
-    async def url_processor(self):
-        """Create a UrlProcessor instance for testing with proper cleanup."""
-        processor = UrlProcessor()
-        yield processor
-        # Cleanup: close the HTTP client after test
-        await processor.http_client.aclose()
-
-    @pytest.fixture
+    @pytest.fixture(scope="session")
     def mock_html_recipe(self):
         """Mock HTML content with recipe data."""
         return '''
@@ -90,7 +139,7 @@ class TestUrlProcessor:
         </html>
         '''
 
-    @pytest.fixture
+    @pytest.fixture(scope="session")
     def mock_html_microdata(self):
         """Mock HTML content with microdata recipe."""
         return '''
@@ -123,7 +172,7 @@ class TestUrlProcessor:
         </html>
         '''
 
-    @pytest.fixture
+    @pytest.fixture(scope="session")
     def mock_html_no_recipe(self):
         """Mock HTML content without recipe data."""
         return '''
@@ -138,88 +187,64 @@ class TestUrlProcessor:
         </html>
         '''
 
-    def test_validate_url_valid(self, url_processor):
+    @pytest.mark.parametrize("url", [
+        "https://example.com",
+        "http://example.com",
+        "https://example.com/recipe/123",
+        "http://subdomain.example.com/path"
+    ])
+    def test_validate_url_valid(self, url_processor, url):
         """Test URL validation with valid URLs."""
-        valid_urls = [
-            "https://example.com",
-            "http://example.com",
-            "https://example.com/recipe/123",
-            "http://subdomain.example.com/path"
-        ]
-        
-        for url in valid_urls:
-            assert url_processor.validate_url(url)
-
-    def test_validate_url_invalid(self, url_processor):
+        assert url_processor.validate_url(url)
+
+    @pytest.mark.parametrize("url", [
+        "",
+        "not-a-url",
+        "ftp://example.com",
+        "javascript:alert('xss')",
+        "file:///etc/passwd"
+    ])
+    def test_validate_url_invalid(self, url_processor, url):
         """Test URL validation with invalid URLs."""
-        invalid_urls = [
-            "",
-            "not-a-url",
-            "ftp://example.com",
-            "javascript:alert('xss')",
-            "file:///etc/passwd"
-        ]
-        
-        for url in invalid_urls:
-            assert not url_processor.validate_url(url)
-
-    def test_normalize_url(self, url_processor):
+        assert not url_processor.validate_url(url)
+
+    @pytest.mark.parametrize("input_url,expected", [
+        ("example.com", "https://example.com"),
+        ("www.example.com/recipe", "https://www.example.com/recipe"),
+        ("https://example.com", "https://example.com"),
+        ("http://example.com", "http://example.com"),
+        ("  example.com  ", "https://example.com")
+    ])
+    def test_normalize_url(self, url_processor, input_url, expected):
         """Test URL normalization."""
-        test_cases = [
-            ("example.com", "https://example.com"),
-            ("www.example.com/recipe", "https://www.example.com/recipe"),
-            ("https://example.com", "https://example.com"),
-            ("http://example.com", "http://example.com"),
-            ("  example.com  ", "https://example.com")
-        ]
-        
-        for input_url, expected in test_cases:
-            result = url_processor.normalize_url(input_url)
-            assert result == expected
+        assert url_processor.normalize_url(input_url) == expected
 
     @pytest.mark.asyncio
-    async def test_fetch_content_success(self, url_processor, mock_html_recipe):
+    async def test_fetch_content_success(self, url_processor, http_routes, mock_html_recipe):
         """Test successful content fetching."""
-        mock_response = Mock()
-        mock_response.status_code = 200
-        mock_response.text = mock_html_recipe
-        mock_response.url = "https://example.com/recipe"
-        mock_response.headers = {"content-type": "text/html"}
-        mock_response.encoding = "utf-8"
-
-        # Mock the persistent HTTP client's get method
-        with patch.object(url_processor.http_client, 'get', new_callable=AsyncMock) as mock_get:
-            mock_get.return_value = mock_response
-            
-            result = await url_processor.fetch_content("https://example.com/recipe")
-            
-            assert result['success'] is True
-            assert result['content'] == mock_html_recipe
-            assert result['status_code'] == 200
+        http_routes["https://example.com/recipe"] = [_mk_resp(text=mock_html_recipe)]
+        
+        result = await url_processor.fetch_content("https://example.com/recipe")
+        
+        assert result['success'] is True
+        assert result['content'] == mock_html_recipe
+        assert result['status_code'] == 200
 
     @pytest.mark.asyncio
-    async def test_fetch_content_http_error(self, url_processor):
+    async def test_fetch_content_http_error(self, url_processor, http_routes):
         """Test content fetching with HTTP error."""
-        mock_response = Mock()
-        mock_response.status_code = 404
-        mock_response.request = Mock()
-
-        # Mock the persistent HTTP client's get method
-        with patch.object(url_processor.http_client, 'get', new_callable=AsyncMock) as mock_get:
-            mock_get.side_effect = httpx.HTTPStatusError("404", request=mock_response.request, response=mock_response)
-            
-            with pytest.raises(Exception, match="Failed to fetch URL"):
-                await url_processor.fetch_content("https://example.com/404")
+        http_routes["https://example.com/404"] = [_mk_resp(status=404)]
+        
+        with pytest.raises(Exception, match="Failed to fetch URL"):
+            await url_processor.fetch_content("https://example.com/404")
 
     @pytest.mark.asyncio
-    async def test_fetch_content_timeout(self, url_processor):
+    async def test_fetch_content_timeout(self, url_processor, http_routes):
         """Test content fetching with timeout."""
-        # Mock the persistent HTTP client's get method
-        with patch.object(url_processor.http_client, 'get', new_callable=AsyncMock) as mock_get:
-            mock_get.side_effect = httpx.TimeoutException("Request timeout")
-            
-            with pytest.raises(Exception, match="Failed to fetch URL"):
-                await url_processor.fetch_content("https://example.com/slow", {'max_retries': 1})
+        http_routes["https://example.com/slow"] = [httpx.TimeoutException("Request timeout")]
+        
+        with pytest.raises(Exception, match="Failed to fetch URL"):
+            await url_processor.fetch_content("https://example.com/slow", {'max_retries': 1})
 
     def test_extract_json_ld_recipe(self, url_processor, mock_html_recipe):
         """Test JSON-LD recipe extraction."""
@@ -235,6 +260,33 @@ class TestUrlProcessor:
         assert "15 minutes" in content  # Converted from PT15M
         assert "12 minutes" in content  # Converted from PT12M
 
+    def test_extract_recipe_content_cache(self, url_processor, mock_html_microdata):
+        """Test that repeated extraction of the same HTML is served from cache."""
+        with patch.object(url_processor, '_extract_recipe_content',
+                          wraps=url_processor._extract_recipe_content) as mock_extract:
+            first = url_processor.extract_recipe_content(mock_html_microdata, "https://example.com")
+            second = url_processor.extract_recipe_content(mock_html_microdata, "https://example.com/other")
+        
+        assert mock_extract.call_count == 1
+        assert first == second
+        # Callers get their own dict, not the cached one
+        assert first is not second
+
+    def test_extract_recipe_content_cache_bounded(self, url_processor, monkeypatch):
+        """Test that the extraction cache evicts the least recently used entry."""
+        monkeypatch.setattr(url_processor, 'CACHE_MAX_SIZE', 2)
+        pages = [f"<html><body><p>Page {i}</p></body></html>" for i in range(3)]
+        
+        url_processor.extract_recipe_content(pages[0], "https://example.com/0")
+        url_processor.extract_recipe_content(pages[1], "https://example.com/1")
+        # Touch page 0 so page 1 becomes the eviction candidate
+        url_processor.extract_recipe_content(pages[0], "https://example.com/0")
+        url_processor.extract_recipe_content(pages[2], "https://example.com/2")
+        
+        assert len(url_processor.cache) == 2
+        assert url_processor._generate_content_cache_key(pages[0]) in url_processor.cache
+        assert url_processor._generate_content_cache_key(pages[1]) not in url_processor.cache
+
     def test_extract_microdata_recipe(self, url_processor, mock_html_microdata):
         """Test microdata recipe extraction."""
         result = url_processor.extract_recipe_content(mock_html_microdata, "https://example.com")
@@ -257,22 +309,19 @@ class TestUrlProcessor:
         content = result['content']
         assert "My Day at the Beach" in content
 
-    def test_parse_duration(self, url_processor):
+    @pytest.mark.parametrize("duration,expected", [
+        ("PT15M", 15),
+        ("PT1H", 60),
+        ("PT1H30M", 90),
+        ("PT2H45M", 165),
+        ("PT0M", 0),
+        ("", None),
+        (None, None),
+        ("invalid", None)
+    ])
+    def test_parse_duration(self, url_processor, duration, expected):
         """Test ISO 8601 duration parsing."""
-        test_cases = [
-            ("PT15M", 15),
-            ("PT1H", 60),
-            ("PT1H30M", 90),
-            ("PT2H45M", 165),
-            ("PT0M", 0),
-            ("", None),
-            (None, None),
-            ("invalid", None)
-        ]
-        
-        for duration, expected in test_cases:
-            result = url_processor._parse_duration(duration)
-            assert result == expected
+        assert url_processor._parse_duration(duration) == expected
 
     def test_score_recipe_content(self, url_processor):
         """Test recipe content scoring."""
@@ -332,45 +381,35 @@ class TestUrlProcessor:
         assert "1 cup sugar" in clean_text
 
     @pytest.mark.asyncio
-    async def test_process_url_full_flow(self, url_processor, mock_html_recipe):
+    async def test_process_url_full_flow(self, url_processor, http_routes, mock_html_recipe):
         """Test the complete URL processing flow."""
-        mock_response = Mock()
-        mock_response.status_code = 200
-        mock_response.text = mock_html_recipe
-        mock_response.url = "https://example.com/recipe"
-        mock_response.headers = {"content-type": "text/html"}
-        mock_response.encoding = "utf-8"
-
-        # Mock the persistent HTTP client's get method
-        with patch.object(url_processor.http_client, 'get', new_callable=AsyncMock) as mock_get:
-            mock_get.return_value = mock_response
-            
-            result = await url_processor.process_url("https://example.com/recipe")
-            
-            assert result['success'] is True
-            assert result['source_url'] == "https://example.com/recipe"
-            assert result['extraction_method'] == 'json-ld'
-            assert result['confidence'] == UrlProcessor.CONFIDENCE_JSON_LD
-            assert "Chocolate Chip Cookies" in result['content']
-            assert 'processing_time' in result
-            assert 'metadata' in result
+        http_routes["https://example.com/recipe"] = [_mk_resp(text=mock_html_recipe)]
+        
+        result = await url_processor.process_url("https://example.com/recipe")
+        
+        assert result['success'] is True
+        assert result['source_url'] == "https://example.com/recipe"
+        assert result['extraction_method'] == 'json-ld'
+        assert result['confidence'] == UrlProcessor.CONFIDENCE_JSON_LD
+        assert "Chocolate Chip Cookies" in result['content']
+        assert 'processing_time' in result
+        assert 'metadata' in result
 
     @pytest.mark.asyncio
-    async def test_process_url_failure(self, url_processor):
+    async def test_process_url_failure(self, url_processor, http_routes):
         """Test URL processing failure handling."""
-        # Mock the persistent HTTP client's get method
-        with patch.object(url_processor.http_client, 'get', new_callable=AsyncMock) as mock_get:
-            mock_get.side_effect = httpx.HTTPStatusError("404", request=Mock(), response=Mock(status_code=404))
-            
-            result = await url_processor.process_url("https://example.com/404", {'max_retries': 1})
-            
-            assert result['success'] is False
-            assert 'error' in result
-            assert result['source_url'] == "https://example.com/404"
-
-    def test_hebrew_content_handling(self, url_processor):
-        """Test handling of Hebrew recipe content."""
-        hebrew_html = '''
+        http_routes["https://example.com/404"] = [_mk_resp(status=404)]
+        
+        result = await url_processor.process_url("https://example.com/404", {'max_retries': 1})
+        
+        assert result['success'] is False
+        assert 'error' in result
+        assert result['source_url'] == "https://example.com/404"
+
+    @pytest.fixture(scope="session")
+    def hebrew_html(self):
+        """Mock HTML content with a Hebrew JSON-LD recipe."""
+        return '''
         <script type="application/ld+json">
         {
             "@context": "https://schema.org",
@@ -391,7 +430,9 @@ class TestUrlProcessor:
         }
         </script>
         '''
-        
+
+    def test_hebrew_content_handling(self, url_processor, hebrew_html):
+        """Test handling of Hebrew recipe content."""
         result = url_processor.extract_recipe_content(hebrew_html, "https://example.co.il")
         
         assert result['extraction_method'] == 'json-ld'
@@ -404,10 +445,6 @@ class TestUrlProcessor:
 class TestUrlProcessorEdgeCases:
     """Test edge cases and error scenarios."""
 
-    @pytest.fixture
-    def url_processor(self):
-        return UrlProcessor()
-
     def test_malformed_json_ld(self, url_processor):
         """Test handling of malformed JSON-LD."""
         malformed_html = '''
@@ -437,29 +474,17 @@ class TestUrlProcessorEdgeCases:
         assert len(cleaned) <= len(large_content)
 
     @pytest.mark.asyncio
-    async def test_rate_limiting_handling(self, url_processor):
+    async def test_rate_limiting_handling(self, url_processor, http_routes, _no_sleep):
         """Test handling of rate limiting (429 status)."""
-        mock_response_429 = Mock()
-        mock_response_429.status_code = 429
-        mock_response_429.request = Mock()
-
-        mock_response_200 = Mock()
-        mock_response_200.status_code = 200
-        mock_response_200.text = "<html><body>Success</body></html>"
-        mock_response_200.url = "https://example.com"
-        mock_response_200.headers = {"content-type": "text/html"}
-        mock_response_200.encoding = "utf-8"
-
-        # Mock the persistent HTTP client's get method
-        with patch.object(url_processor.http_client, 'get', new_callable=AsyncMock) as mock_get:
-            # First call returns 429 response, second call succeeds
-            mock_get.side_effect = [
-                mock_response_429,  # Return 429 response object
-                mock_response_200   # Return 200 response object
-            ]
-            
-            with patch('asyncio.sleep', new_callable=AsyncMock) as mock_sleep:
-                result = await url_processor.fetch_content("https://example.com", {'retry_delay': 0.1})
-                
-                assert result['success'] is True
-                assert mock_sleep.called  # Should have slept before retry
\ No newline at end of file
+        # First call returns 429 response, second call succeeds
+        http_routes["https://example.com"] = [
+            _mk_resp(status=429),
+            _mk_resp(text="<html><body>Success</body></html>")
+        ]
+        
+        result = await url_processor.fetch_content("https://example.com", {'retry_delay': 0.1})
+        
+        assert result['success'] is True
+        assert _no_sleep  # Should have slept before retry
+        # The 429 was served first; only the sticky 200 remains queued
+        assert len(http_routes["https://example.com"]) == 1